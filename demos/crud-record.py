@@ -1,69 +1,122 @@
+import atexit
 import sqlite3
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from contextlib import contextmanager
 
-DB_PATH = "habits.db"
+# Own file: this demo keeps TEXT dates, while habits.db stores day ordinals
+DB_PATH = "crud-record.db"
+
+_CONN: Optional[sqlite3.Connection] = None
+
+def _connect() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        # Autocommit mode: _get_connection() opens and closes every transaction itself
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=rwc",
+            uri=True,
+            isolation_level=None,
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA cache_size = -65536;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+
+        # publish the connection only once the schema is in place
+        try:
+            _init_db(conn)
+        except Exception:
+            conn.close()
+            raise
+        atexit.register(_close_connection, conn)
+        _CONN = conn
+    return _CONN
+
+def _close_connection(conn: sqlite3.Connection):
+    # let the planner refresh the statistics for tables that changed enough
+    conn.execute("PRAGMA optimize;")
+    conn.close()
 
 @contextmanager
 def _get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = _connect()
+    conn.execute("BEGIN")
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
-def _init_db():
-    with _get_connection() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit TEXT NOT NULL UNIQUE
-            )
-        """)
-
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER NOT NULL,
-                date DATE NOT NULL,
-                FOREIGN KEY (habit_id) 
-                    REFERENCES habits (id) 
-                    ON DELETE CASCADE,
-                UNIQUE (habit_id, date)
-            )
-        """)
+def _init_db(conn: sqlite3.Connection):
+    # The scripts run their own BEGIN/COMMIT, so they are not wrapped in
+    # _get_connection(): executescript() would commit its transaction first.
+    conn.executescript("""
+        BEGIN;
+
+        CREATE TABLE IF NOT EXISTS habits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit TEXT NOT NULL UNIQUE
+        );
 
-def create_habit(habit: str) -> int:
-    _init_db()
+        CREATE TABLE IF NOT EXISTS records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            FOREIGN KEY (habit_id) 
+                REFERENCES habits (id) 
+                ON DELETE CASCADE,
+            UNIQUE (habit_id, date)
+        );
+
+        COMMIT;
+    """)
+
+def create_habit(habit: str) -> Tuple[int, str]:
     if not habit or not habit.strip():
         raise ValueError("Habit cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "INSERT INTO habits (habit) VALUES (?)",
+                "INSERT INTO habits (habit) VALUES (?) RETURNING id, habit",
                 (habit.strip(),)
             )
-            return cursor.lastrowid
+            result = cursor.fetchone()
+            return (result['id'], result['habit'])
+    except sqlite3.IntegrityError:
+        raise ValueError("Habit already exists")
+
+def create_habits_bulk(habits: List[str]) -> int:
+    if any(not habit or not habit.strip() for habit in habits):
+        raise ValueError("Habit cannot be empty")
+
+    try:
+        with _get_connection() as conn:
+            cursor = conn.executemany(
+                "INSERT INTO habits (habit) VALUES (?)",
+                [(habit.strip(),) for habit in habits]
+            )
+            return cursor.rowcount
     except sqlite3.IntegrityError:
         raise ValueError("Habit already exists")
 
 def read_habits() -> List[Tuple[int, str, str]]:
-    _init_db()
     with _get_connection() as conn:
-        cursor = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
             "SELECT id, habit FROM habits ORDER BY habit"
         )
-        return [(row['id'], row['habit']) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
 def update_habit(habit_id: int, new_habit: str) -> bool:
-    _init_db()
     if not new_habit or not new_habit.strip():
         raise ValueError("Habit cannot be empty")
     
@@ -79,7 +132,6 @@ def update_habit(habit_id: int, new_habit: str) -> bool:
 
 
 def delete_habit(habit_id: int) -> bool:
-    _init_db()
     with _get_connection() as conn:
         cursor = conn.execute(
             "DELETE FROM habits WHERE id = ?",
@@ -87,32 +139,46 @@ def delete_habit(habit_id: int) -> bool:
         )
         return cursor.rowcount > 0
 
-def create_record(habit_id: int, date: str) -> int:
-    _init_db()
+def create_record(habit_id: int, date: str) -> Tuple[int, str]:
     if not date or not date.strip():
         raise ValueError("Date cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "INSERT INTO records (habit_id, date) VALUES (?, ?)",
+                "INSERT INTO records (habit_id, date) VALUES (?, ?) RETURNING id, date",
                 (habit_id, date.strip())
             )
-            return cursor.lastrowid
+            result = cursor.fetchone()
+            return (result['id'], result['date'])
+    except sqlite3.IntegrityError:
+        raise ValueError("Record already exists")
+
+def create_records_bulk(pairs: List[Tuple[int, str]]) -> int:
+    if any(not date or not date.strip() for _, date in pairs):
+        raise ValueError("Date cannot be empty")
+
+    try:
+        with _get_connection() as conn:
+            cursor = conn.executemany(
+                "INSERT INTO records (habit_id, date) VALUES (?, ?)",
+                [(habit_id, date.strip()) for habit_id, date in pairs]
+            )
+            return cursor.rowcount
     except sqlite3.IntegrityError:
         raise ValueError("Record already exists")
 
 def read_records(habit_id: int) -> List[Tuple[int, str]]:
-    _init_db()
     with _get_connection() as conn:
-        cursor = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
             "SELECT id, date FROM records WHERE habit_id = ? ORDER BY date DESC",
             (habit_id,)
         )
-        return [(row['id'], row['date']) for row in cursor.fetchall()]
+        return cursor.fetchall()
     
 def update_record(record_id: int, date: str) -> bool:
-    _init_db()
     if not date or not date.strip():
         raise ValueError("Date cannot be empty")
     
@@ -127,7 +193,6 @@ def update_record(record_id: int, date: str) -> bool:
         raise ValueError("Record already exists")
 
 def delete_record(record_id: int) -> bool:
-    _init_db()
     with _get_connection() as conn:
         cursor = conn.execute(
             "DELETE FROM records WHERE id = ?",
@@ -137,23 +202,26 @@ def delete_record(record_id: int) -> bool:
 
 
 if __name__ == "__main__":
-    _init_db()
-    print(create_habit("Running"))
-    print(create_habit("Reading"))
-    print(create_habit("Meditation"))
-    print(create_habit("Morning Run"))
-    print(create_habit("Run at Night"))
-    print(create_habit("Gym"))
-    print(create_habit("Yoga"))
-    print(create_habit("Coding"))
+    print(create_habits_bulk([
+        "Running",
+        "Reading",
+        "Meditation",
+        "Morning Run",
+        "Run at Night",
+        "Gym",
+        "Yoga",
+        "Coding",
+    ]))
     print(read_habits())
 
-    print(create_record(1, "2025-01-01"))
-    print(create_record(2, "2025-01-01"))
-    print(create_record(2, "2025-01-02"))
-    print(create_record(3, "2025-01-01"))
-    print(create_record(3, "2025-01-02"))
-    print(create_record(3, "2025-01-03"))
+    print(create_records_bulk([
+        (1, "2025-01-01"),
+        (2, "2025-01-01"),
+        (2, "2025-01-02"),
+        (3, "2025-01-01"),
+        (3, "2025-01-02"),
+        (3, "2025-01-03"),
+    ]))
     print(read_records(1))
     print(read_records(2))
     print(read_records(3))
\ No newline at end of file
@@ -1,32 +1,38 @@
-import os
 import sys
+from contextlib import contextmanager
 import termios
 import tty
 
-def clear():
-    os.system('clear')
+CLEAR = "\x1b[2J\x1b[H"  # erase screen, cursor home
 
-def get_char():
-    fd = sys.stdin.fileno()
+@contextmanager
+def raw_mode(fd):
     old_settings = termios.tcgetattr(fd)
     try:
-        tty.setraw(sys.stdin.fileno())
-        ch = sys.stdin.read(1)
-
-        if ch == "\x1b": # ESC key
-            ch2 = sys.stdin.read(1)
-            if ch2 == "[":
-                ch3 = sys.stdin.read(1)
-                if ch3 == "A":  # Up arrow
-                    return "UP"
-                elif ch3 == "B":  # Down arrow
-                    return "DOWN"
-                elif ch3 == "C":  # Right arrow - ignore
-                    return None
-                elif ch3 == "D":  # Left arrow - ignore
-                    return None
+        tty.setraw(fd)
+        # keep output processing so results can still be printed line by line
+        settings = termios.tcgetattr(fd)
+        settings[1] |= termios.OPOST | termios.ONLCR
+        termios.tcsetattr(fd, termios.TCSADRAIN, settings)
+        yield
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+def get_char():
+    ch = sys.stdin.read(1)
+
+    if ch == "\x1b": # ESC key
+        ch2 = sys.stdin.read(1)
+        if ch2 == "[":
+            ch3 = sys.stdin.read(1)
+            if ch3 == "A":  # Up arrow
+                return "UP"
+            elif ch3 == "B":  # Down arrow
+                return "DOWN"
+            elif ch3 == "C":  # Right arrow - ignore
+                return None
+            elif ch3 == "D":  # Left arrow - ignore
+                return None
     return ch
 
 options = [
@@ -39,28 +45,29 @@ options = [
     "Yoga",
     "Coding"
 ]
+options_lower = [(item, item.lower()) for item in options]
 
 def search_bar():
     query = ""
     selected_index = 0
 
     while True:
-        clear()
-        print("Habit: " + query) 
+        buf = [CLEAR, "Habit: " + query + "\n"]
 
-        matches = []
-        for item in options:
-            if query.lower() in item.lower():
-                matches.append(item)
+        query_lower = query.lower()
+        matches = [item for item, item_lower in options_lower if query_lower in item_lower]
 
         # Limit displayed results
         display_matches = matches[:5]
         
         for i in range(len(display_matches)):
             if i == selected_index and len(display_matches) > 0:
-                print(" >", display_matches[i])
+                buf.append(" > " + display_matches[i] + "\n")
             else:
-                print(" ", display_matches[i])
+                buf.append("   " + display_matches[i] + "\n")
+
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
 
         ch = get_char()
 
@@ -86,4 +93,5 @@ def search_bar():
             selected_index = 0
 
 if __name__ == "__main__":
-    search_bar()
\ No newline at end of file
+    with raw_mode(sys.stdin.fileno()):
+        search_bar()
\ No newline at end of file
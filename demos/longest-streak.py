@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date
 
 dates = [
     "2025-01-01", "2025-01-02", "2025-01-03",
@@ -13,29 +13,28 @@ def longest_streak(days):
     parsed_dates = []
     for day in days:
         try:
-            parsed_dates.append(datetime.strptime(day, "%Y-%m-%d").date())
+            parsed_dates.append(date.fromisoformat(day))
         except ValueError:
             raise ValueError(f"Invalid date format: {day}")
     
-    unique_dates = sorted(set(parsed_dates))
+    ordinals = {day.toordinal() for day in parsed_dates}
+
+    # Only walk forward from days that start a streak, so each day is
+    # visited at most twice and no sort is needed.
+    max_streak = 0
+    for start in ordinals:
+        if start - 1 in ordinals:
+            continue
+        end = start
+        while end + 1 in ordinals:
+            end += 1
+        max_streak = max(max_streak, end - start + 1)
 
-    max_streak = 1
-    current_streak = 1
-    
-    for i in range(1, len(unique_dates)):
-        if unique_dates[i] - unique_dates[i-1] == timedelta(days=1):
-            current_streak += 1
-        else:
-            max_streak = max(max_streak, current_streak)
-            current_streak = 1
-    
-    max_streak = max(max_streak, current_streak)
-    
     return max_streak
 
 
 if __name__ == "__main__":
-    for date in dates:
-        print(datetime.strptime(date, "%Y-%m-%d").date(), end=" ")
+    for day in dates:
+        print(date.fromisoformat(day), end=" ")
     print()
     print("Longest streak: ", longest_streak(dates))
@@ -1,13 +1,15 @@
+import atexit
 import sqlite3
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from contextlib import contextmanager
 
 import os
+import select
 import sys
 import termios
 import tty
 
-from datetime import datetime, timedelta
+from datetime import date, datetime
 
 
 # Constants
@@ -15,66 +17,183 @@ from datetime import datetime, timedelta
 WIDTH = 50
 DB_PATH = "habits.db"
 MAX_MENU_OPTIONS = 5
+SEPARATOR = "─" * WIDTH
+BLANK = " " * WIDTH
+INITIAL_HEADER = ["🏡 Habit Tracker".center(WIDTH), SEPARATOR, BLANK]
+ADD_HABIT_HEADER = ["📝 Add a new habit".center(WIDTH), SEPARATOR, BLANK]
+ADD_RECORD_HEADER = ["📝 Add a new record".center(WIDTH), SEPARATOR, BLANK]
+HABITS_TITLE = "📋 My Habits".center(WIDTH)
+NAV_HINT = "ESC = Back | ENTER = Select"
+PAGE_HEADER = f"{{:<{WIDTH - len(NAV_HINT)}}}{NAV_HINT}"  # page label padded left, hint flush right
+CLEAR = "\x1b[2J\x1b[H"  # erase screen, cursor home
+MAX_INSERT_ROWS = 250  # 2 params per row, well under SQLite's 999 bound-parameter limit
 
 # Database
 
+_SQL_INSERT_HABIT = "INSERT INTO habits (habit) VALUES (?) RETURNING id, habit"
+_SQL_FIND_HABIT_BY_NAME = "SELECT id, habit FROM habits WHERE habit = ?"
+_SQL_FIND_HABIT_BY_ID = "SELECT id, habit FROM habits WHERE id = ?"
+_SQL_READ_HABITS = "SELECT id, habit FROM habits ORDER BY habit"
+_SQL_READ_HABITS_PAGE = _SQL_READ_HABITS + " LIMIT ? OFFSET ?"
+_SQL_COUNT_HABITS = "SELECT COUNT(*) FROM habits"
+_SQL_UPDATE_HABIT = "UPDATE habits SET habit = ? WHERE id = ? RETURNING *"
+_SQL_DELETE_HABIT = "DELETE FROM habits WHERE id = ? RETURNING *"
+# records.date holds the day ordinal (0001-01-01 = 1); this turns it back into
+# YYYY-MM-DD text, ordinal + 1721424.5 being the Julian day at midnight
+_SQL_RECORD_COLUMNS = "id, habit_id, date(date + 1721424.5) AS date"
+_SQL_INSERT_RECORD = f"INSERT INTO records (habit_id, date) VALUES (?, ?) RETURNING {_SQL_RECORD_COLUMNS}"
+# Multi-row insert: full chunks reuse one statement, only a shorter last
+# chunk builds its own
+_SQL_INSERT_RECORDS = "INSERT OR IGNORE INTO records (habit_id, date) VALUES "
+_SQL_INSERT_RECORDS_CHUNK = _SQL_INSERT_RECORDS + ",".join(["(?, ?)"] * MAX_INSERT_ROWS)
+_SQL_READ_RECORDS = f"SELECT {_SQL_RECORD_COLUMNS} FROM records WHERE habit_id = ? ORDER BY records.date DESC"
+_SQL_READ_RECORDS_PAGE = _SQL_READ_RECORDS + " LIMIT ? OFFSET ?"
+_SQL_FIND_RECORD_BY_DATE = f"SELECT {_SQL_RECORD_COLUMNS} FROM records WHERE habit_id = ? AND records.date = ?"
+_SQL_COUNT_RECORDS = "SELECT COUNT(*) FROM records WHERE habit_id = ?"
+_SQL_UPDATE_RECORD = f"UPDATE records SET date = ? WHERE id = ? RETURNING {_SQL_RECORD_COLUMNS}"
+_SQL_DELETE_RECORD = f"DELETE FROM records WHERE id = ? RETURNING {_SQL_RECORD_COLUMNS}"
+# Consecutive day ordinals share the same (date - row number) anchor, so the
+# longest streak is the size of the largest group
+_SQL_LONGEST_STREAK = """
+    SELECT MAX(cnt) FROM (
+        SELECT COUNT(*) AS cnt FROM (
+            SELECT date - ROW_NUMBER() OVER (ORDER BY date) AS grp
+            FROM records
+            WHERE habit_id = ?
+        )
+        GROUP BY grp
+    )
+"""
+
+_CONN: Optional[sqlite3.Connection] = None
+# ids of pre-ordinal records whose dates the migration could not parse
+_UNREADABLE_RECORDS: List[int] = []
+
+def _connect() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        # Autocommit mode: _get_connection() opens and closes every transaction itself
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=rwc",
+            uri=True,
+            isolation_level=None,
+            timeout=5.0,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA cache_size = -65536;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+
+        # publish the connection only once the schema and migration are in place
+        try:
+            _init_db(conn)
+        except Exception:
+            conn.close()
+            raise
+        atexit.register(_close_connection, conn)
+        _CONN = conn
+    return _CONN
+
+def _close_connection(conn: sqlite3.Connection):
+    # let the planner refresh the statistics for tables that changed enough
+    conn.execute("PRAGMA optimize;")
+    conn.close()
+
 @contextmanager
 def _get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = _connect()
+    conn.execute("BEGIN")
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
-def _init_db():
-    with _get_connection() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit TEXT NOT NULL UNIQUE
-            )
-        """)
-
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER NOT NULL,
-                date DATE NOT NULL,
-                FOREIGN KEY (habit_id) 
-                    REFERENCES habits (id) 
-                    ON DELETE CASCADE,
-                UNIQUE (habit_id, date)
-            )
-        """)
+def _init_db(conn: sqlite3.Connection):
+    # The scripts run their own BEGIN/COMMIT, so they are not wrapped in
+    # _get_connection(): executescript() would commit its transaction first.
+    # The UNIQUE (habit_id, date) constraint below creates the only index
+    # records needs: read_records, find_record_by_date and the streak query
+    # are all served as covering index searches, and SQLite walks it backwards
+    # for ORDER BY date DESC, so no separate descending index is created.
+    conn.executescript("""
+        BEGIN;
+
+        CREATE TABLE IF NOT EXISTS habits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) 
+                REFERENCES habits (id) 
+                ON DELETE CASCADE,
+            UNIQUE (habit_id, date)
+        );
+
+        COMMIT;
+    """)
+
+    # Databases created before dates were stored as day ordinals. Those dates
+    # were checked with strptime("%Y-%m-%d"), which also accepts unpadded
+    # ones like 2024-1-5, so the same parser converts them. Day duplicates
+    # that only differed in padding collapse into one record. Rows it cannot
+    # parse are left as they are and kept in _UNREADABLE_RECORDS for
+    # main_loop() to report, and user_version stays at 0 until they are
+    # gone, so the conversion is retried on every start.
+    if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                "SELECT id, date FROM records WHERE typeof(date) = 'text'"
+            ).fetchall()
+            ordinals = []
+            skipped = []
+            for record_id, date_text in rows:
+                try:
+                    ordinals.append((datetime.strptime(date_text.strip(), "%Y-%m-%d").toordinal(), record_id))
+                except ValueError:
+                    skipped.append(record_id)
+            conn.executemany("UPDATE OR REPLACE records SET date = ? WHERE id = ?", ordinals)
+            if not skipped:
+                conn.execute("PRAGMA user_version = 1")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        _UNREADABLE_RECORDS[:] = skipped
+
+def _to_ordinal(date_text: str) -> int:
+    return date.fromisoformat(date_text.strip()).toordinal()
 
 def create_habit(habit_text: str) -> Tuple[int, str]:
-    _init_db()
-    
     if not habit_text or not habit_text.strip():
         raise ValueError("Habit cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "INSERT INTO habits (habit) VALUES (?)",
+                _SQL_INSERT_HABIT,
                 (habit_text.strip(),)
             )
-            return (cursor.lastrowid, habit_text.strip())
+            result = cursor.fetchone()
+            return (result['id'], result['habit'])
     except sqlite3.IntegrityError:
         raise sqlite3.IntegrityError("Habit already exists")
 
 def find_habit_by_name(habit_text: str) -> Tuple[int, str]:
-    _init_db()
-
     with _get_connection() as conn:
         cursor = conn.execute(
-            "SELECT id, habit FROM habits WHERE habit = ?",
+            _SQL_FIND_HABIT_BY_NAME,
             (habit_text.strip(),)
         )
         result = cursor.fetchone()
@@ -84,11 +203,9 @@ def find_habit_by_name(habit_text: str) -> Tuple[int, str]:
             raise ValueError("Habit not found")
 
 def find_habit_by_id(habit_id: int) -> Tuple[int, str]:
-    _init_db()
-
     with _get_connection() as conn:
         cursor = conn.execute(
-            "SELECT id, habit FROM habits WHERE id = ?",
+            _SQL_FIND_HABIT_BY_ID,
             (habit_id,)
         )
         result = cursor.fetchone()
@@ -98,20 +215,34 @@ def find_habit_by_id(habit_id: int) -> Tuple[int, str]:
             raise ValueError("Habit not found")
 
 def read_habits() -> List[Tuple[int, str]]:
-    _init_db()
+    with _get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            _SQL_READ_HABITS
+        )
+        return cursor.fetchall()
 
+def read_habits_page(offset: int, limit: int) -> List[Tuple[int, str]]:
     with _get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT id, habit FROM habits ORDER BY habit"
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            _SQL_READ_HABITS_PAGE,
+            (limit, offset)
         )
-        return [(row['id'], row['habit']) for row in cursor.fetchall()]
+        return cursor.fetchall()
+
+def count_habits() -> int:
+    with _get_connection() as conn:
+        cursor = conn.execute(_SQL_COUNT_HABITS)
+        return cursor.fetchone()[0]
 
 def find_record_by_date(habit: Tuple[int, str], date: str) -> Tuple[int, int, str]:
-    _init_db()
     with _get_connection() as conn:
         cursor = conn.execute(
-            "SELECT id, habit_id, date FROM records WHERE habit_id = ? AND date = ?",
-            (habit[0], date.strip())
+            _SQL_FIND_RECORD_BY_DATE,
+            (habit[0], _to_ordinal(date))
         )
         result = cursor.fetchone()
         if result:
@@ -121,15 +252,13 @@ def find_record_by_date(habit: Tuple[int, str], date: str) -> Tuple[int, int, st
 
 
 def update_habit(habit: Tuple[int, str], new_habit: str) -> Tuple[int, str]:
-    _init_db()
-
     if not new_habit or not new_habit.strip():
         raise ValueError("Habit cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "UPDATE habits SET habit = ? WHERE id = ? RETURNING *",
+                _SQL_UPDATE_HABIT,
                 (new_habit.strip(), habit[0])
             )
             result = cursor.fetchone()
@@ -139,53 +268,87 @@ def update_habit(habit: Tuple[int, str], new_habit: str) -> Tuple[int, str]:
 
 
 def delete_habit(habit: Tuple[int, str]) -> Tuple[int, str]:
-    _init_db()
-
-    habit = find_habit_by_id(habit[0])
     with _get_connection() as conn:
         cursor = conn.execute(
-            "DELETE FROM habits WHERE id = ? RETURNING *",
+            _SQL_DELETE_HABIT,
             (habit[0],)
         )
         result = cursor.fetchone()
-        return (result['id'], result['habit'])
+        if result:
+            return (result['id'], result['habit'])
+        else:
+            raise ValueError("Habit not found")
 
 def create_record(habit: Tuple[int, str], date: str) -> Tuple[int, int, str]:
-    _init_db()
-
     if not date or not date.strip():
         raise ValueError("Date cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "INSERT INTO records (habit_id, date) VALUES (?, ?) RETURNING *",
-                (habit[0], date.strip())
+                _SQL_INSERT_RECORD,
+                (habit[0], _to_ordinal(date))
             )
             result = cursor.fetchone()
             return (result['id'], result['habit_id'], result['date'])
     except sqlite3.IntegrityError:
         raise sqlite3.IntegrityError("Record already exists")
 
+def create_records_many(habit: Tuple[int, str], dates: List[str]) -> int:
+    if any(not date or not date.strip() for date in dates):
+        raise ValueError("Date cannot be empty")
+
+    params = [value for date in dates for value in (habit[0], _to_ordinal(date))]
+    inserted = 0
+
+    with _get_connection() as conn:
+        for i in range(0, len(params), MAX_INSERT_ROWS * 2):
+            chunk = params[i:i + MAX_INSERT_ROWS * 2]
+            if len(chunk) == MAX_INSERT_ROWS * 2:
+                sql = _SQL_INSERT_RECORDS_CHUNK
+            else:
+                sql = _SQL_INSERT_RECORDS + ",".join(["(?, ?)"] * (len(chunk) // 2))
+            cursor = conn.execute(sql, chunk)
+            inserted += cursor.rowcount
+    return inserted
+
 def read_records(habit: Tuple[int, str]) -> List[Tuple[int, int, str]]:
-    _init_db()
+    with _get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            _SQL_READ_RECORDS,
+            (habit[0],)
+        )
+        return cursor.fetchall()
+
+def read_records_page(habit: Tuple[int, str], offset: int, limit: int) -> List[Tuple[int, int, str]]:
+    with _get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            _SQL_READ_RECORDS_PAGE,
+            (habit[0], limit, offset)
+        )
+        return cursor.fetchall()
+
+def count_records(habit: Tuple[int, str]) -> int:
     with _get_connection() as conn:
         cursor = conn.execute(
-            "SELECT id, habit_id, date FROM records WHERE habit_id = ? ORDER BY date DESC",
+            _SQL_COUNT_RECORDS,
             (habit[0],)
         )
-        return [(row['id'], row['habit_id'], row['date']) for row in cursor.fetchall()]
+        return cursor.fetchone()[0]
     
 def update_record(record: Tuple[int, int, str], date: str) -> Tuple[int, int, str]:
-    _init_db()
     if not date or not date.strip():
         raise ValueError("Date cannot be empty")
     
     try:
         with _get_connection() as conn:
             cursor = conn.execute(
-                "UPDATE records SET date = ? WHERE id = ? RETURNING *",
-                (date.strip(), record[0])
+                _SQL_UPDATE_RECORD,
+                (_to_ordinal(date), record[0])
             )
             result = cursor.fetchone()
             return (result['id'], result['habit_id'], result['date'])
@@ -193,10 +356,9 @@ def update_record(record: Tuple[int, int, str], date: str) -> Tuple[int, int, st
         raise sqlite3.IntegrityError("Record already exists")
 
 def delete_record(record: Tuple[int, int, str]) -> Tuple[int, int, str]:
-    _init_db()
     with _get_connection() as conn:
         cursor = conn.execute(
-            "DELETE FROM records WHERE id = ? RETURNING *",
+            _SQL_DELETE_RECORD,
             (record[0],)
         )
         result = cursor.fetchone()
@@ -205,26 +367,81 @@ def delete_record(record: Tuple[int, int, str]) -> Tuple[int, int, str]:
 # Menu
 
 def clear():
-    os.system('clear')
+    sys.stdout.write(CLEAR)
+    sys.stdout.flush()
 
 
-def get_char():
-    fd = sys.stdin.fileno()
+@contextmanager
+def raw_mode(fd: int):
     old_settings = termios.tcgetattr(fd)
     try:
-        tty.setraw(sys.stdin.fileno())
-        ch = sys.stdin.read(1)
-
-        if ch == "\x1b": # ESC key
-            ch2 = sys.stdin.read(1)
-            if ch2 == "[":
-                ch3 = sys.stdin.read(1)
-                if ch3 == "A":  # Up arrow
-                    return "UP"
-                elif ch3 == "B":  # Down arrow
-                    return "DOWN"
+        tty.setraw(fd)
+        # keep output processing so menus can still print line by line
+        settings = termios.tcgetattr(fd)
+        settings[1] |= termios.OPOST | termios.ONLCR
+        termios.tcsetattr(fd, termios.TCSADRAIN, settings)
+        yield
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+def render_menu(texts: List[str], labels: List[str], selected_index: int):
+    # texts are complete header rows, already centred by the caller
+    buf = [CLEAR]
+    for textrow in texts:
+        buf.append(textrow + "\n")
+    for i in range(len(labels)):
+        if i == selected_index:
+            buf.append(" > " + labels[i] + "\n")
+        else:
+            buf.append("   " + labels[i] + "\n")
+    sys.stdout.write("".join(buf))
+    sys.stdout.flush()
+
+def move_marker(texts: List[str], labels: List[str], old_index: int, new_index: int):
+    # Rewrite only the two marker cells instead of the whole frame; rows are
+    # 1-based and the marker sits in column 2. That addressing assumes one
+    # terminal line per row, so a frame with a row that can wrap (a long
+    # habit name) is redrawn in full instead.
+    if old_index == new_index:
+        return
+    if any(len(text) > WIDTH for text in texts) or any(len(label) + 3 > WIDTH for label in labels):
+        render_menu(texts, labels, new_index)
+        return
+    # Park the cursor below the options again, where render_menu() leaves
+    # it, so screens that print without clearing start under the frame.
+    header_rows = len(texts)
+    sys.stdout.write(
+        f"\x1b[{header_rows + old_index + 1};2H "
+        f"\x1b[{header_rows + new_index + 1};2H>"
+        f"\x1b[{header_rows + len(labels) + 1};1H"
+    )
+    sys.stdout.flush()
+
+def get_char():
+    # Read the descriptor directly: a buffered sys.stdin could swallow the
+    # rest of an escape sequence and hide it from select().
+    fd = sys.stdin.fileno()
+    ch = os.read(fd, 1).decode(errors="ignore")
+
+    if ch == "\x1b": # ESC key
+        # Arrow keys send their CSI tail immediately; a lone ESC does not.
+        # The tail can still arrive split (e.g. over SSH), so keep reading
+        # until both bytes are in or the line goes quiet.
+        seq = ""
+        while len(seq) < 2:
+            ready, _, _ = select.select([fd], [], [], 0.05)
+            if not ready:
+                break
+            seq += os.read(fd, 2 - len(seq)).decode(errors="ignore")
+
+        if seq == "[A":  # Up arrow
+            return "UP"
+        elif seq == "[B":  # Down arrow
+            return "DOWN"
+        elif seq == "[C":  # Right arrow
+            return "RIGHT"
+        elif seq == "[D":  # Left arrow
+            return "LEFT"
     return ch
 
 def initial_menu():
@@ -236,54 +453,38 @@ def initial_menu():
 
     selected_index = 0
     selected_option = None
+    drawn_index = None
 
-    while selected_option is None:
-        clear()
-        
-        texts = [
-            "🏡 Habit Tracker",
-            "─" * WIDTH,
-            " " * WIDTH
-        ]
-
-        for textrow in texts:
-            print(textrow.center(WIDTH))
+    labels = [item[1] for item in options]
 
-    
-        for i in range(len(options)):
-            if i == selected_index:
-                print(" >", options[i][1])
+    with raw_mode(sys.stdin.fileno()):
+        while selected_option is None:
+            if drawn_index is None:
+                render_menu(INITIAL_HEADER, labels, selected_index)
             else:
-                print(" ", options[i][1])  
-
-        ch = get_char()
-        if ch == "\x1b":  # ESC key
-            break
-        elif ch == "\r":  # Enter
-            selected_option = options[selected_index][0]
-        elif ch == "UP":
-            selected_index = (selected_index - 1) % len(options)
-        elif ch == "DOWN":
-            selected_index = (selected_index + 1) % len(options)
+                move_marker(INITIAL_HEADER, labels, drawn_index, selected_index)
+            drawn_index = selected_index
+
+            ch = get_char()
+            if ch == "\x1b":  # ESC key
+                break
+            elif ch == "\r":  # Enter
+                selected_option = options[selected_index][0]
+            elif ch == "UP":
+                selected_index = (selected_index - 1) % len(options)
+            elif ch == "DOWN":
+                selected_index = (selected_index + 1) % len(options)
 
     if selected_option == 1:
-        add_habit_menu()
+        return ("add_habit", ())
     elif selected_option == 2:
-        select_habit_menu()
-    elif selected_option == 3:
-        exit()
+        return ("select_habit", ())
+    return (None, ())
 
 def add_habit_menu():
     clear()
     
-    texts = [
-        "📝 Add a new habit",
-        "─" * WIDTH,
-        " " * WIDTH,
-    ]
-
-    for textrow in texts:
-        print(textrow.center(WIDTH))
+    print(*ADD_HABIT_HEADER, sep="\n")
 
     habit_text = input("Enter a new habit: ")
     habit = None
@@ -300,69 +501,66 @@ def add_habit_menu():
     input("Press Enter to continue...")
 
     if habit is None:
-        initial_menu()
-        return
+        return ("initial", ())
     
-    habit_menu(habit)
+    return ("habit", (habit,))
 
 def select_habit_menu():
-    habits = read_habits()
+    habits_count = count_habits()
 
-    if len(habits) == 0:
+    if habits_count == 0:
         print("No habits found!")
         input("Press Enter to continue...")
-        initial_menu()
-        return
+        return ("initial", ())
         
-    pages = [habits[i:i+MAX_MENU_OPTIONS] for i in range(0, len(habits), MAX_MENU_OPTIONS)]
-    pages_count = len(pages)
+    pages_count = (habits_count + MAX_MENU_OPTIONS - 1) // MAX_MENU_OPTIONS
 
     current_page = 0
+    page = read_habits_page(0, MAX_MENU_OPTIONS)
     selected_index = 0
     selected_habit = None
-
-    while selected_habit is None:
-        clear()
-
-        texts = [
-            "📋 My Habits",
-            "─" * WIDTH,
-            f"Page {current_page + 1} of {pages_count}".ljust(WIDTH - len("ESC = Back | ENTER = Select")) + "ESC = Back | ENTER = Select",
-            " " * WIDTH,
-        ]
-
-        for textrow in texts:
-            print(textrow.center(WIDTH))
-
-        for i in range(len(pages[current_page])):
-            if i == selected_index:
-                print(" >", pages[current_page][i][1])
+    drawn_index = None
+
+    with raw_mode(sys.stdin.fileno()):
+        while selected_habit is None:
+            if drawn_index is None:
+                texts = [
+                    HABITS_TITLE,
+                    SEPARATOR,
+                    PAGE_HEADER.format(f"Page {current_page + 1} of {pages_count}"),
+                    BLANK,
+                ]
+                labels = [item[1] for item in page]
+                render_menu(texts, labels, selected_index)
             else:
-                print(" ", pages[current_page][i][1])
-        ch = get_char()
-
-        if ch == "\x1b":  # ESC key
-            initial_menu()
-            return
-        elif ch == "\r":  # Enter
-            selected_habit = pages[current_page][selected_index]
-            break
-        elif ch == "UP":
-            selected_index -= 1
-            if selected_index < 0:
-                current_page = (current_page - 1) % pages_count
-                selected_index = len(pages[current_page]) - 1
-        elif ch == "DOWN":
-            selected_index += 1
-            if selected_index >= len(pages[current_page]):
-                current_page = (current_page + 1) % pages_count
-                selected_index = 0
+                move_marker(texts, labels, drawn_index, selected_index)
+            drawn_index = selected_index
+            ch = get_char()
+
+            if ch == "\x1b":  # ESC key
+                return ("initial", ())
+            elif ch == "\r":  # Enter
+                selected_habit = page[selected_index]
+                break
+            elif ch == "UP":
+                selected_index -= 1
+                if selected_index < 0:
+                    current_page = (current_page - 1) % pages_count
+                    page = read_habits_page(current_page * MAX_MENU_OPTIONS, MAX_MENU_OPTIONS)
+                    drawn_index = None
+                    selected_index = len(page) - 1
+            elif ch == "DOWN":
+                selected_index += 1
+                if selected_index >= len(page):
+                    current_page = (current_page + 1) % pages_count
+                    page = read_habits_page(current_page * MAX_MENU_OPTIONS, MAX_MENU_OPTIONS)
+                    drawn_index = None
+                    selected_index = 0
 
     if selected_habit is None:
-        initial_menu()
-        return
+        return ("initial", ())
 
-    habit_menu(selected_habit)
+    return ("habit", (selected_habit,))
 
 def habit_menu(habit: Tuple[int, str]):
     options = [
@@ -375,84 +573,58 @@ def habit_menu(habit: Tuple[int, str]):
 
     selected_index = 0
     selected_option = None
+    drawn_index = None
     longest_streak = check_longest_streak(habit)
 
-    while selected_option is None:
-        clear()
-        
-        texts = [
-            f"📋 Habit: {habit[1]}",
-            f"Longest streak: {longest_streak} days",
-            "─" * WIDTH,
-            " " * WIDTH,
-        ]
-
-        for textrow in texts:
-            print(textrow.center(WIDTH))
-
-        for i in range(len(options)):
-            if i == selected_index:
-                print(" >", options[i][1])
+    texts = [
+        f"📋 Habit: {habit[1]}".center(WIDTH),
+        f"Longest streak: {longest_streak} days".center(WIDTH),
+        SEPARATOR,
+        BLANK,
+    ]
+    labels = [item[1] for item in options]
+
+    with raw_mode(sys.stdin.fileno()):
+        while selected_option is None:
+            if drawn_index is None:
+                render_menu(texts, labels, selected_index)
             else:
-                print(" ", options[i][1])
-        ch = get_char()
-        if ch == "\x1b":  # ESC key
-            break
-        elif ch == "\r":  # Enter
-            selected_option = options[selected_index][0]
-            break
-        elif ch == "UP":
-            selected_index = (selected_index - 1) % len(options)
-        elif ch == "DOWN":
-            selected_index = (selected_index + 1) % len(options)
+                move_marker(texts, labels, drawn_index, selected_index)
+            drawn_index = selected_index
+            ch = get_char()
+            if ch == "\x1b":  # ESC key
+                break
+            elif ch == "\r":  # Enter
+                selected_option = options[selected_index][0]
+                break
+            elif ch == "UP":
+                selected_index = (selected_index - 1) % len(options)
+            elif ch == "DOWN":
+                selected_index = (selected_index + 1) % len(options)
 
     if selected_option == 1:
-        add_record_menu(habit)
+        return ("add_record", (habit,))
     elif selected_option == 2:
-        select_record_menu(habit)
+        return ("select_record", (habit,))
     elif selected_option == 3:
-        update_habit_menu(habit)
+        return ("update_habit", (habit,))
     elif selected_option == 4:
-        delete_habit_menu(habit)
-    else:
-        select_habit_menu()
+        return ("delete_habit", (habit,))
+    return ("select_habit", ())
 
 
 def check_longest_streak(habit: Tuple[int, str]) -> int:
-    records = read_records(habit)
-
-    if len(records) == 0:
-        return 0
-
-    parsed_records = []
-    for record in records:
-        parsed_records.append(datetime.strptime(record[2], "%Y-%m-%d").date())
-
-    parsed_records = sorted(parsed_records)
-
-    longest_streak = 0
-    current_streak = 1
-    for i in range(1, len(parsed_records)):
-        if parsed_records[i] - parsed_records[i-1] == timedelta(days=1):
-            current_streak += 1
-        else:
-            longest_streak = max(longest_streak, current_streak)
-            current_streak = 1
-    
-    longest_streak = max(longest_streak, current_streak)
-    
-    return longest_streak
+    with _get_connection() as conn:
+        cursor = conn.execute(
+            _SQL_LONGEST_STREAK,
+            (habit[0],)
+        )
+        return cursor.fetchone()[0] or 0
 
 def update_habit_menu(habit: Tuple[int, str]):
     clear()
 
-    texts = [
-        f"📋 Update Habit: {habit[1]}",
-        "─" * WIDTH,
-        " " * WIDTH,
-    ]
-    for textrow in texts:
-        print(textrow.center(WIDTH))
+    print(f"📋 Update Habit: {habit[1]}".center(WIDTH), SEPARATOR, BLANK, sep="\n")
 
     new_habit = input("Enter the new name of the habit: ")
 
@@ -466,10 +638,7 @@ def update_habit_menu(habit: Tuple[int, str]):
 
     input("Press Enter to continue...")
 
-    habit_menu(habit)
-    return
-
-    
+    return ("habit", (habit,))
 
 def delete_habit_menu(habit: Tuple[int, str]):
     try:
@@ -479,37 +648,37 @@ def delete_habit_menu(habit: Tuple[int, str]):
         print(f"Error: {e}")
     input("Press Enter to continue...")
 
-    select_habit_menu()
+    return ("select_habit", ())
 
 def add_record_menu(habit: Tuple[int, str]):
     clear()
     
-    texts = [
-        "📝 Add a new record",
-        "─" * WIDTH,
-        " " * WIDTH,
-    ]
-
-    for textrow in texts:
-        print(textrow.center(WIDTH))
+    print(*ADD_RECORD_HEADER, sep="\n")
 
     record = None
-    date = input("Enter the date of the record (YYYY-MM-DD): \n")
+    date_text = input("Enter the date of the record (YYYY-MM-DD), or several separated by commas: \n")
 
     # validate date format
     try:
-        datetime.strptime(date, "%Y-%m-%d")
+        dates = [date.fromisoformat(part.strip()).isoformat() for part in date_text.split(",")]
     except ValueError:
         print("Invalid date format! Please use the format YYYY-MM-DD")
         input("Press Enter to continue...")
-        add_record_menu(habit)
-        return
+        return ("add_record", (habit,))
+
+    if len(dates) > 1:
+        added = create_records_many(habit, dates)
+        print(f"{added} of {len(dates)} records added successfully")
+        input("Press Enter to continue...")
+        return ("habit", (habit,))
+
+    date_text = dates[0]
 
     try:
-        record = create_record(habit, date)
+        record = create_record(habit, date_text)
         print("Record added successfully")
     except sqlite3.IntegrityError:
-        record = find_record_by_date(habit, date)
+        record = find_record_by_date(habit, date_text)
         print("Record already exists!")
     except ValueError as e:
         print(f"Error: {e}")
@@ -517,68 +686,66 @@ def add_record_menu(habit: Tuple[int, str]):
     input("Press Enter to continue...")
 
     if record is None:
-        habit_menu(habit)
-        return
+        return ("habit", (habit,))
 
-    record_menu(habit, record)
+    return ("record", (habit, record))
 
 def select_record_menu(habit: Tuple[int, str]):
-    records = read_records(habit)
+    records_count = count_records(habit)
 
-    if len(records) == 0:
+    if records_count == 0:
         print("No records found!")
         input("Press Enter to continue...")
-        habit_menu(habit)
-        return
+        return ("habit", (habit,))
     
-    pages = [records[i:i+MAX_MENU_OPTIONS] for i in range(0, len(records), MAX_MENU_OPTIONS)]
-    pages_count = len(pages)
+    pages_count = (records_count + MAX_MENU_OPTIONS - 1) // MAX_MENU_OPTIONS
 
     current_page = 0
+    page = read_records_page(habit, 0, MAX_MENU_OPTIONS)
     selected_index = 0
     selected_record = None
-
-    while selected_record is None:
-        clear()
-
-        texts = [
-            f"📋 Records: {habit[1]}",
-            "─" * WIDTH,
-            f"Page {current_page + 1} of {pages_count}".ljust(WIDTH - len("ESC = Back | ENTER = Select")) + "ESC = Back | ENTER = Select",
-            " " * WIDTH,
-        ]
-
-        for textrow in texts:
-            print(textrow.center(WIDTH))
-
-        for i in range(len(pages[current_page])):
-            if i == selected_index:
-                print(" >", pages[current_page][i][2])
+    drawn_index = None
+
+    with raw_mode(sys.stdin.fileno()):
+        while selected_record is None:
+            if drawn_index is None:
+                texts = [
+                    f"📋 Records: {habit[1]}".center(WIDTH),
+                    SEPARATOR,
+                    PAGE_HEADER.format(f"Page {current_page + 1} of {pages_count}"),
+                    BLANK,
+                ]
+                labels = [item[2] for item in page]
+                render_menu(texts, labels, selected_index)
             else:
-                print(" ", pages[current_page][i][2])
-        ch = get_char()
-
-        if ch == "\x1b":  # ESC key
-            break
-        elif ch == "\r":  # Enter
-            selected_record = pages[current_page][selected_index]
-            break
-        elif ch == "UP":
-            selected_index -= 1
-            if selected_index < 0:
-                current_page = (current_page - 1) % pages_count
-                selected_index = len(pages[current_page]) - 1
-        elif ch == "DOWN":
-            selected_index += 1
-            if selected_index >= len(pages[current_page]):
-                current_page = (current_page + 1) % pages_count
-                selected_index = 0
+                move_marker(texts, labels, drawn_index, selected_index)
+            drawn_index = selected_index
+            ch = get_char()
+
+            if ch == "\x1b":  # ESC key
+                break
+            elif ch == "\r":  # Enter
+                selected_record = page[selected_index]
+                break
+            elif ch == "UP":
+                selected_index -= 1
+                if selected_index < 0:
+                    current_page = (current_page - 1) % pages_count
+                    page = read_records_page(habit, current_page * MAX_MENU_OPTIONS, MAX_MENU_OPTIONS)
+                    drawn_index = None
+                    selected_index = len(page) - 1
+            elif ch == "DOWN":
+                selected_index += 1
+                if selected_index >= len(page):
+                    current_page = (current_page + 1) % pages_count
+                    page = read_records_page(habit, current_page * MAX_MENU_OPTIONS, MAX_MENU_OPTIONS)
+                    drawn_index = None
+                    selected_index = 0
 
     if selected_record is None:
-        habit_menu(habit)
-        return
+        return ("habit", (habit,))
 
-    record_menu(habit, selected_record)
+    return ("record", (habit, selected_record))
 
 def record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
     options = [
@@ -589,68 +756,57 @@ def record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
 
     selected_index = 0
     selected_option = None
+    drawn_index = None
+
+    texts = [
+        f"📋 Record: {habit[1]} - {record[2]}".center(WIDTH),
+        SEPARATOR,
+        BLANK,
+    ]
+    labels = [item[1] for item in options]
 
-    while selected_option is None:
-        clear()
-
-        texts = [
-            f"📋 Record: {habit[1]} - {record[2]}",
-            "─" * WIDTH,
-            " " * WIDTH,
-        ]
-
-        for textrow in texts:
-            print(textrow.center(WIDTH))
-            
-        for i in range(len(options)):
-            if i == selected_index:
-                print(" >", options[i][1])
+    with raw_mode(sys.stdin.fileno()):
+        while selected_option is None:
+            if drawn_index is None:
+                render_menu(texts, labels, selected_index)
             else:
-                print(" ", options[i][1])
-        ch = get_char()
-        if ch == "\x1b":  # ESC key
-            break
-
-        if ch == "\r":  # Enter
-            selected_option = options[selected_index][0]
-            break
-        elif ch == "UP":
-            selected_index = (selected_index - 1) % len(options)
-        elif ch == "DOWN":
-            selected_index = (selected_index + 1) % len(options)
+                move_marker(texts, labels, drawn_index, selected_index)
+            drawn_index = selected_index
+            ch = get_char()
+            if ch == "\x1b":  # ESC key
+                break
+
+            if ch == "\r":  # Enter
+                selected_option = options[selected_index][0]
+                break
+            elif ch == "UP":
+                selected_index = (selected_index - 1) % len(options)
+            elif ch == "DOWN":
+                selected_index = (selected_index + 1) % len(options)
 
     if selected_option == 1:
-        update_record_menu(habit, record)
+        return ("update_record", (habit, record))
     elif selected_option == 2:
-        delete_record_menu(habit, record)
-    else:
-        select_record_menu(habit)
+        return ("delete_record", (habit, record))
+    return ("select_record", (habit,))
 
 def update_record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
     clear()
 
-    texts = [
-        f"📋 Update Record: {habit[1]} - {record[2]}",
-        "─" * WIDTH,
-        " " * WIDTH,
-    ]
-    
-    for textrow in texts:
-        print(textrow.center(WIDTH))
+    print(f"📋 Update Record: {habit[1]} - {record[2]}".center(WIDTH), SEPARATOR, BLANK, sep="\n")
 
-    date = input("Enter the new date of the record (YYYY-MM-DD): \n")
+    date_text = input("Enter the new date of the record (YYYY-MM-DD): \n")
     
     # validate date format
     try:
-        datetime.strptime(date, "%Y-%m-%d")
+        date_text = date.fromisoformat(date_text).isoformat()
     except ValueError:
         print("Invalid date format! Please use the format YYYY-MM-DD")
         input("Press Enter to continue...")
-        update_record_menu(habit, record)
-        return
+        return ("update_record", (habit, record))
 
     try:
-        record = update_record(record, date)
+        record = update_record(record, date_text)
         print("Record updated successfully")
     except sqlite3.IntegrityError:
         print("Record already exists!")
@@ -659,19 +815,11 @@ def update_record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
 
     input("Press Enter to continue...")
 
-
-    record_menu(habit, record)  
+    return ("record", (habit, record))
 
 def delete_record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
     clear()
-    texts = [
-        f"📋 Delete Record: {habit[1]} - {record[2]}",
-        "─" * WIDTH,
-        " " * WIDTH,
-    ]
-
-    for textrow in texts:
-        print(textrow.center(WIDTH))
+    print(f"📋 Delete Record: {habit[1]} - {record[2]}".center(WIDTH), SEPARATOR, BLANK, sep="\n")
 
     try:
         delete_record(record)
@@ -681,7 +829,37 @@ def delete_record_menu(habit: Tuple[int, str], record: Tuple[int, int, str]):
 
     input("Press Enter to continue...")
     
-    select_record_menu(habit)
+    return ("select_record", (habit,))
+
+# Each menu returns the name of the next menu and the arguments to call it
+# with, so navigating between screens never grows the call stack.
+MENUS = {
+    "initial": initial_menu,
+    "add_habit": add_habit_menu,
+    "select_habit": select_habit_menu,
+    "habit": habit_menu,
+    "update_habit": update_habit_menu,
+    "delete_habit": delete_habit_menu,
+    "add_record": add_record_menu,
+    "select_record": select_record_menu,
+    "record": record_menu,
+    "update_record": update_record_menu,
+    "delete_record": delete_record_menu,
+}
+
+def main_loop():
+    # Open the database before the first frame so a migration warning is not
+    # cleared away by it
+    _connect()
+    if _UNREADABLE_RECORDS:
+        print(f"{len(_UNREADABLE_RECORDS)} record(s) have unreadable dates and were left as they are.")
+        print(f"Record ids: {', '.join(map(str, _UNREADABLE_RECORDS))}")
+        print("Fix or delete them; the conversion is retried on the next start.")
+        input("Press Enter to continue...")
+
+    state, args = "initial", ()
+    while state is not None:
+        state, args = MENUS[state](*args)
 
 if __name__ == "__main__":
-    initial_menu()
\ No newline at end of file
+    main_loop()
\ No newline at end of file